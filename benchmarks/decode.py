@@ -0,0 +1,72 @@
+"""Benchmark of block decoding with different process pool sizes.
+
+Usage: python -m benchmarks.decode [blocks] [txs per block]
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+from bitui.network.decode import DecodeConfig
+from bitui.network.decode import Decoder
+
+
+def _raw_block(height: int, n_tx: int) -> bytes:
+    vin = [{'txid': '00' * 32, 'vout': 0, 'sequence': 4294967295}]
+    vout = [
+        {'value': 0.5, 'n': i, 'scriptPubKey': {'hex': '00' * 22}}
+        for i in range(2)
+    ]
+    tx = {'txid': '00' * 32, 'vin': vin, 'vout': vout}
+    block = {
+        'height': height,
+        'hash': f'{height:064x}',
+        'time': 1231006505 + height,
+        'nonce': 0,
+        'confirmations': 1,
+        'size': 0,
+        'weight': 0,
+        'nTx': n_tx,
+        'tx': [tx] * n_tx,
+    }
+    return json.dumps({'result': block, 'error': None, 'id': '1'}).encode()
+
+
+def main() -> int:
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    n_tx = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+
+    raws = [_raw_block(h, n_tx) for h in range(blocks)]
+    size = sum(len(raw) for raw in raws) / 2**20
+    print(f'{blocks} blocks, {n_tx} txs each, {size:.1f} MiB')
+
+    cpus = os.cpu_count() or 1
+    workers = [0] + [w for w in (1, 2, 4, 8) if w <= cpus]
+
+    baseline = None
+    for worker in workers:
+        for chunksize in (1, 4):
+            if worker == 0 and chunksize != 1:
+                continue
+            decoder = Decoder(DecodeConfig(worker, chunksize))
+            # start the processes before timing
+            decoder.map(raws[:worker])
+
+            start = time.perf_counter()
+            decoder.map(raws)
+            elapsed = time.perf_counter() - start
+            decoder.shutdown()
+
+            baseline = baseline or elapsed
+            print(
+                f'workers={worker} chunksize={chunksize}: '
+                f'{elapsed:.3f}s ({baseline / elapsed:.2f}x)',
+            )
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
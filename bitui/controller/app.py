@@ -4,17 +4,36 @@ from __future__ import annotations
 
 import curses
 import enum
+import pathlib
 import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import TYPE_CHECKING
 
+from bitui.controller import session
+from bitui.controller.session import Snapshot
+from bitui.controller.utxo import JobState
+from bitui.controller.utxo import UTXOCache
+from bitui.controller.utxo import UTXOJob
 from bitui.network.btc import BitcoinAPI
+from bitui.network.decode import BlockSummary
+from bitui.network.decode import DecodeConfig
+from bitui.network.decode import Decoder
+from bitui.network.poll import Dashboard
+from bitui.network.poll import NodeConfig
+from bitui.network.poll import NodeStatus
+from bitui.network.poll import PollConfig
 from bitui.network.rpc import RPCConfig
+from bitui.screen.state import draw_too_small
+from bitui.screen.state import terminal_fits
 from bitui.screen.state import TUIState
 
 if TYPE_CHECKING:
     from typing import TypeAlias
     Screen: TypeAlias = curses._CursesWindow
+    # chain info and raw blocks fetched to replace a session snapshot
+    _Reload: TypeAlias = tuple[dict[Any, Any], list[bytes]]
 
 
 class Action(enum.Enum):
@@ -22,16 +41,61 @@ class Action(enum.Enum):
     QUIT = enum.auto()
 
 
+class Panel(enum.Enum):
+    """What is shown in the lower window."""
+    SUMMARY = enum.auto()
+    UTXO = enum.auto()
+    NODES = enum.auto()
+
+
+# seconds to wait for a burst of resize events to settle
+RESIZE_DEBOUNCE = 0.15
+# seconds between checks of a snapshot against an unreachable node
+RECONCILE_RETRY = 10.0
+
+
 class App:
 
     def __init__(
         self,
         stdscr: Screen,
         rpc_config: RPCConfig,
+        decode_config: DecodeConfig = DecodeConfig(),
+        session_path: pathlib.Path | None = None,
+        utxo_cache_dir: pathlib.Path | None = None,
+        node_configs: list[NodeConfig] = [],
+        poll_config: PollConfig = PollConfig(),
     ) -> None:
 
         self._state = TUIState.init(stdscr)
+        self._rpc_config = rpc_config
         self._api = BitcoinAPI(rpc_config)
+        self._background = ThreadPoolExecutor(max_workers=1)
+        self._verbosity = decode_config.verbosity
+        self._decoder = Decoder(decode_config)
+        # decoded chunks of blocks, in chain order
+        self._pending: list[Future[list[BlockSummary]]] = []
+        # summaries of the blocks in the chain, in the same order
+        self._blocks: list[BlockSummary] = []
+        self._session_path = session_path
+        # chain info and raw blocks, `None` if the snapshot is up to date
+        self._reload: Future[_Reload | None] | None = None
+        self._reload_at: float | None = None
+        # shown over the summary while the snapshot isn't confirmed
+        self._stale: str | None = None
+        self._panel = Panel.SUMMARY
+        self._dashboard = Dashboard(node_configs, poll_config)
+        # comparing nodes is the point of passing several of them
+        if len(self._dashboard) > 1:
+            self._panel = Panel.NODES
+        self._utxo_cache = UTXOCache(utxo_cache_dir)
+        self._utxo_job: UTXOJob | None = None
+        # last collected, for whichever tip the node had then
+        self._utxo_result: dict[Any, Any] | None = None
+        self._resize_at: float | None = None
+        # the old state is kept, but not drawn, while the terminal is too
+        # small to build a new one
+        self._too_small = False
 
     def query_chain(self) -> None:
         """Queries `blockchaininfo`."""
@@ -40,29 +104,293 @@ class App:
 
     def display_summary(self) -> None:
         summary = _summary_info(self._state.chain_info)
-        self._state.lower_win.screen.addstr(summary)
+        if self._stale is not None:
+            summary = f'[{self._stale}]\n{summary}'
+
+        win = self._state.lower_win.screen
+        win.erase()
+        _, width = win.getmaxyx()
+        for y, line in enumerate(summary.splitlines()):
+            try:
+                win.addnstr(y, 0, line, width)
+            except curses.error:
+                # the window shrank, show what fits
+                break
+
+    def display_utxo(self) -> None:
+        result = self._utxo_result
+        job = self._utxo_job
+
+        if job is not None and job.state == JobState.PENDING:
+            text = (
+                f'utxo set: computing for {job.elapsed:.0f}s, '
+                'x to cancel'
+            )
+        elif job is not None and job.state == JobState.FAILED:
+            text = f'utxo set: failed, {job.error!r}'
+        elif job is not None and job.state == JobState.CANCELLED:
+            text = 'utxo set: cancelled'
+        elif result is not None:
+            text = f'utxo set\n{_summary_info(result)}'
+        else:
+            text = 'utxo set: not computed yet'
 
-    def _query_block(self, height: int) -> dict[Any, Any]:
-        hash_result = self._api.get_block_hash(height)
-        block_result = self._api.get_block(hash_result)
+        win = self._state.lower_win.screen
+        win.erase()
+        try:
+            win.addstr(text)
+        except curses.error:
+            # doesn't fit the window
+            pass
+
+    def display_nodes(self) -> None:
+        text = _nodes_info(self._dashboard.statuses)
 
-        return block_result
+        win = self._state.lower_win.screen
+        win.erase()
+        _, width = win.getmaxyx()
+        for y, line in enumerate(text.splitlines()):
+            try:
+                win.addnstr(y, 0, line, width)
+            except curses.error:
+                # more nodes than lines
+                break
+
+    def display_panel(self) -> None:
+        if self._panel == Panel.UTXO:
+            self.display_utxo()
+        elif self._panel == Panel.NODES:
+            self.display_nodes()
+        else:
+            self.display_summary()
+
+    def toggle_nodes(self) -> None:
+        """Switches between the summary and the nodes comparison."""
+        if self._panel == Panel.NODES:
+            self._panel = Panel.SUMMARY
+        else:
+            self._panel = Panel.NODES
+        self.display_panel()
+
+    def toggle_utxo(self) -> None:
+        """Switches between the summary and the UTXO set panel."""
+        if self._panel == Panel.UTXO:
+            self._panel = Panel.SUMMARY
+        else:
+            self._panel = Panel.UTXO
+            self.query_utxo()
+        self.display_panel()
+
+    def query_utxo(self) -> None:
+        """Starts a job asking the node for its tip, then for the UTXO set
+        at that tip unless it is cached. Nothing if one is still running.
+        """
+        job = self._utxo_job
+        if job is not None and job.running:
+            # either still computing, or cancelled and winding down
+            return
+
+        self._utxo_job = UTXOJob(self._rpc_config, self._utxo_cache)
+
+    def cancel_utxo(self) -> None:
+        job = self._utxo_job
+        if job is not None and job.state == JobState.PENDING:
+            job.cancel()
+
+    def collect_utxo(self) -> None:
+        """Caches the finished `gettxoutsetinfo`, if any."""
+        job = self._utxo_job
+        if job is None or job.state != JobState.DONE:
+            return
+
+        result = job.result
+        # the tip might have moved while computing, the result has its own
+        # `bestblock` and `height` to tell which block it belongs to
+        if job.tip is not None:
+            self._utxo_cache.put(job.tip, result)
+        if 'bestblock' in result:
+            self._utxo_cache.put(result['bestblock'], result)
+        self._utxo_result = result
+        self._utxo_job = None
 
     def display_last_blocks(self, n: int) -> None:
+        """Queries the last `n` blocks. They are displayed by
+        `collect_blocks` once decoded.
+        """
         height = self._state.chain_info['blocks']
 
-        start = max(0, height - n)
+        raws = _query_blocks(self._api, height, n, self._verbosity)
+        self._pending.extend(self._decoder.submit(raws))
+        self.collect_blocks()
+
+    def collect_blocks(self) -> None:
+        """Add the decoded blocks to the chain without waiting, keeping
+        their order.
+        """
+        while self._pending and self._pending[0].done():
+            try:
+                summaries = self._pending.pop(0).result()
+            except Exception as exc:
+                # a bad block or a dead worker shouldn't take the UI down,
+                # the failed chunk is shown as a single tile instead
+                self._state.chain.new_block(_decode_error_info(exc))
+                continue
+
+            for summary in summaries:
+                self._add_block(summary)
+
+    def _add_block(self, summary: BlockSummary) -> None:
+        self._blocks.append(summary)
+        self._state.chain.new_block(_block_info(summary))
+
+    def restore_session(self) -> bool:
+        """Paints the snapshot of the last session, if there's one, and
+        checks in the background whether the node's tip is still the same.
+        Returns whether it was restored.
+        """
+        if self._session_path is None:
+            return False
+
+        snapshot = session.load(self._session_path)
+        if snapshot is None or not snapshot.blocks:
+            return False
+
+        self._state.chain_info.update(snapshot.chain_info)
+        self._stale = 'last session, checking the node'
+        self.display_panel()
+
+        for summary in snapshot.blocks:
+            self._add_block(summary)
+
+        chain = self._state.chain
+        chain.pad.view_start = chain.start + snapshot.view_offset
+        chain.render()
 
-        for block_h in range(start, height):
-            info = self._query_block(block_h)
-            self._state.chain.new_block(_block_info(info))
+        self._check_snapshot()
+
+        return True
+
+    def _check_snapshot(self) -> None:
+        tip = self._state.chain_info.get('bestblockhash', '')
+        n = len(self._blocks)
+        self._reload = self._background.submit(self._fetch_if_moved, tip, n)
+
+    def _fetch_if_moved(self, tip: str, n: int) -> _Reload | None:
+        """Runs in the background. Fetches the chain info and the last `n`
+        blocks, unless the node's tip is still `tip`.
+        """
+        # `requests.Session` can't be shared between threads
+        api = BitcoinAPI(self._rpc_config)
+        try:
+            if api.get_best_block_hash() == tip:
+                return None
+
+            info = api.get_blockchain_info()
+            raws = _query_blocks(api, info['blocks'], n, self._verbosity)
+        finally:
+            api.close()
+
+        return info, raws
+
+    def reconcile_session(self) -> None:
+        """Swaps the snapshot for what was fetched in the background, if
+        the tip changed since it was taken.
+        """
+        if self._reload_at is not None and time.monotonic() >= self._reload_at:
+            self._reload_at = None
+            self._check_snapshot()
+
+        if self._reload is None or not self._reload.done():
+            return
+
+        reload, self._reload = self._reload, None
+        try:
+            fetched = reload.result()
+        except Exception as exc:
+            # keep showing the snapshot, marked as such, and try again later
+            self._stale = (
+                f'last session, node unreachable ({type(exc).__name__}), '
+                f'retrying every {RECONCILE_RETRY:.0f}s'
+            )
+            self._reload_at = time.monotonic() + RECONCILE_RETRY
+            self.display_panel()
+            return
+
+        self._stale = None
+        if fetched is None:
+            self.display_panel()
+            return
+
+        info, raws = fetched
+        self._state.chain_info.clear()
+        self._state.chain_info.update(info)
+        self.display_panel()
+
+        self._blocks.clear()
+        self._state.chain.clear()
+        self._pending.extend(self._decoder.submit(raws))
+        self.collect_blocks()
+
+    def save_session(self) -> None:
+        """Saves a snapshot of what's on screen for the next start."""
+        if self._session_path is None or not self._blocks:
+            return
+
+        chain = self._state.chain
+        snapshot = Snapshot(
+            self._state.chain_info.get('bestblockhash', ''),
+            chain.pad.view_start - chain.start,
+            self._state.chain_info,
+            self._blocks,
+        )
+        try:
+            session.save(self._session_path, snapshot)
+        except OSError:
+            # the snapshot is only an optimization, quit anyway
+            pass
 
     def tick(self, seconds: float = 0.01) -> None:
         """Sleeps for `seconds`. Sets framerate and slows down CPU usage."""
         time.sleep(seconds)
 
+    def relayout(self) -> None:
+        """Rebuild the screen for the current terminal size. Only uses
+        what's already in the state, the node is not queried.
+        """
+        self._resize_at = None
+        curses.update_lines_cols()
+
+        self._too_small = not terminal_fits()
+        if self._too_small:
+            draw_too_small(self._state.stdscr)
+            return
+
+        self._state = self._state.resize()
+        self.display_panel()
+
+    def close(self) -> None:
+        self._decoder.shutdown()
+        self._background.shutdown(wait=False, cancel_futures=True)
+        self.cancel_utxo()
+        self._dashboard.close()
+
     def refresh(self) -> None:
-        self._state.refresh()
+        self.reconcile_session()
+        self.collect_blocks()
+        self.collect_utxo()
+        if self._panel == Panel.UTXO:
+            self.display_utxo()
+        elif self._panel == Panel.NODES:
+            # nodes are only polled while they're shown
+            self._dashboard.poll()
+            self.display_nodes()
+        if self._resize_at is not None:
+            if time.monotonic() - self._resize_at < RESIZE_DEBOUNCE:
+                # the windows don't match the terminal until rebuilt
+                return
+            self.relayout()
+        if not self._too_small:
+            self._state.refresh()
 
     def get_input(self) -> Action:
         try:
@@ -74,16 +402,42 @@ class App:
                 return Action.QUIT
             elif key == 'h':
                 self._state.upper_pad.scroll(-10)
+                self._state.chain.render()
             elif key == 'l':
                 self._state.upper_pad.scroll(10)
+                self._state.chain.render()
+            elif key == 'u':
+                self.toggle_utxo()
+            elif key == 'x':
+                self.cancel_utxo()
+            elif key == 'n':
+                self.toggle_nodes()
             elif key == curses.KEY_RESIZE:
-                curses.update_lines_cols()
+                # wait for the events to settle before rebuilding
+                self._resize_at = time.monotonic()
             elif key == -1:
                 pass
 
         return Action.RUN
 
 
+def _query_blocks(
+    api: BitcoinAPI,
+    height: int,
+    n: int,
+    verbosity: int,
+) -> list[bytes]:
+    """Raw `getblock` of the last `n` blocks up to `height`."""
+    start = max(0, height - n)
+
+    raws = []
+    for block_h in range(start, height):
+        hash_result = api.get_block_hash(block_h)
+        raws.append(api.get_block_raw(hash_result, verbosity))
+
+    return raws
+
+
 def _summary_info(info: dict[Any, Any]) -> str:
     ret = []
     for key, val in info.items():
@@ -91,13 +445,37 @@ def _summary_info(info: dict[Any, Any]) -> str:
     return '\n'.join(ret)
 
 
-def _block_info(info: dict[Any, Any]) -> str:
-    ret = '\n'.join(
-        [
-            f"height: {info['height']}",
-            f"nonce: {info['nonce']}",
-            f"confirmations: {info['confirmations']}",
-        ],
-    )
+def _nodes_info(statuses: list[NodeStatus]) -> str:
+    ret = [
+        f"{'node':<21} {'chain':<7} {'blocks':>8} {'headers':>8} "
+        f"{'sync':>7} {'rpc':>7}  tip",
+    ]
+    for status in statuses:
+        blocks = '-' if status.blocks is None else status.blocks
+        headers = '-' if status.headers is None else status.headers
+        latency = '-'
+        if status.latency is not None:
+            latency = f'{status.latency * 1000:.0f}ms'
+        tip = status.error or status.tip[-16:]
+        ret.append(
+            f'{status.name[:21]:<21} {status.chain:<7} {blocks:>8} '
+            f'{headers:>8} {status.progress:>7.2%} {latency:>7}  {tip}',
+        )
+    return '\n'.join(ret)
+
+
+def _decode_error_info(exc: Exception) -> str:
+    return f'decode failed\n{type(exc).__name__}\n{exc}'
+
+
+def _block_info(info: BlockSummary) -> str:
+    lines = [
+        f'height: {info.height}',
+        f'nonce: {info.nonce}',
+        f'confirmations: {info.confirmations}',
+        f'txs: {info.n_tx}',
+    ]
+    if info.total_out:
+        lines.append(f'out: {info.total_out:.2f}')
 
-    return ret
+    return '\n'.join(lines)
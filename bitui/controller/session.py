@@ -0,0 +1,71 @@
+"""Snapshots of a session, so the next start can paint the last known
+state before hearing back from the node.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+from typing import Any
+from typing import NamedTuple
+
+from bitui.network.decode import BlockSummary
+
+# bump when the format changes, older snapshots are ignored
+VERSION = 1
+
+
+class Snapshot(NamedTuple):
+    # best block hash when the snapshot was taken
+    tip: str
+    # `Pad.view_start` relative to the first block
+    view_offset: int
+    chain_info: dict[Any, Any]
+    blocks: list[BlockSummary]
+
+    def to_json(self) -> dict[Any, Any]:
+        return {
+            'version': VERSION,
+            'tip': self.tip,
+            'view_offset': self.view_offset,
+            'chain_info': self.chain_info,
+            'blocks': [list(block) for block in self.blocks],
+        }
+
+    @classmethod
+    def from_json(cls, json: dict[Any, Any]) -> Snapshot:
+        if json['version'] != VERSION:
+            raise ValueError(f"unknown snapshot version {json['version']}")
+
+        return cls(
+            json['tip'],
+            json['view_offset'],
+            json['chain_info'],
+            [BlockSummary(*block) for block in json['blocks']],
+        )
+
+
+def snapshot_path(cache_dir: str, url: str, chain: str) -> pathlib.Path:
+    """Path of the snapshot for a node, one per `url` and `chain`."""
+    key = hashlib.sha256(f'{chain} {url}'.encode()).hexdigest()[:16]
+    return pathlib.Path(cache_dir).expanduser() / 'sessions' / f'{key}.json'
+
+
+def save(path: pathlib.Path, snapshot: Snapshot) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # write and rename, so a crash never leaves half a snapshot behind
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as fp:
+        json.dump(snapshot.to_json(), fp)
+    os.replace(tmp, path)
+
+
+def load(path: pathlib.Path) -> Snapshot | None:
+    """Return the snapshot at `path`, or `None` if there's no usable one."""
+    try:
+        with open(path, 'r', encoding='utf-8') as fp:
+            return Snapshot.from_json(json.load(fp))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
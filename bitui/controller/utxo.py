@@ -0,0 +1,151 @@
+"""UTXO set statistics, which can take minutes for the node to compute.
+
+`gettxoutsetinfo` runs in a background thread with its own connection and
+timeout, which can be cancelled, and its result is cached by best block
+hash.
+"""
+from __future__ import annotations
+
+import enum
+import json
+import pathlib
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+
+from bitui.network.btc import BitcoinAPI
+from bitui.network.btc import Calls
+from bitui.network.rpc import JSONRPCException
+from bitui.network.rpc import RPCConfig
+
+# seconds, mainnet can take several minutes
+UTXO_TIMEOUT = 900.0
+
+
+class JobState(enum.Enum):
+    PENDING = enum.auto()
+    DONE = enum.auto()
+    FAILED = enum.auto()
+    CANCELLED = enum.auto()
+
+
+class UTXOCache:
+    """`gettxoutsetinfo` results keyed by best block hash. Kept in memory
+    and, if `cache_dir` is given, on disk.
+    """
+
+    def __init__(self, cache_dir: pathlib.Path | None = None) -> None:
+        self._cache_dir = cache_dir
+        self._results: dict[str, dict[Any, Any]] = {}
+
+    def _path(self, tip: str) -> pathlib.Path | None:
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / f'{tip}.json'
+
+    def get(self, tip: str) -> dict[Any, Any] | None:
+        if tip in self._results:
+            return self._results[tip]
+
+        path = self._path(tip)
+        if path is None:
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as fp:
+                result: dict[Any, Any] = json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+        self._results[tip] = result
+        return result
+
+    def put(self, tip: str, result: dict[Any, Any]) -> None:
+        self._results[tip] = result
+
+        path = self._path(tip)
+        if path is None:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as fp:
+                json.dump(result, fp)
+        except OSError:
+            # the disk cache is only an optimization
+            pass
+
+
+class UTXOJob:
+    """A single `gettxoutsetinfo` call running in the background, for the
+    tip the node has when it starts. A result already in `cache` for that
+    tip is used instead.
+    """
+
+    def __init__(self, rpc_config: RPCConfig, cache: UTXOCache) -> None:
+        # known once the node answered
+        self.tip: str | None = None
+        self.started = time.monotonic()
+        self._api = BitcoinAPI(rpc_config._replace(timeout=UTXO_TIMEOUT))
+        self._cache = cache
+        self._future: Future[dict[Any, Any]] = Future()
+        self._cancelled = False
+
+        # daemon, so quitting doesn't wait for the node
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _call(self, call: Calls) -> Any:
+        response = self._api.method(call)
+        if response.error is not None:
+            raise JSONRPCException(response.error)
+
+        return response.result
+
+    def _run(self) -> None:
+        try:
+            self.tip = self._call(Calls.GETBESTBLOCKHASH)
+            result = self._cache.get(self.tip)
+            if result is None:
+                result = self._call(Calls.GETTXOUTSETINFO)
+        except Exception as exc:
+            self._future.set_exception(exc)
+        else:
+            self._future.set_result(result)
+        finally:
+            self._api.close()
+
+    @property
+    def state(self) -> JobState:
+        if self._cancelled:
+            return JobState.CANCELLED
+        if not self._future.done():
+            return JobState.PENDING
+        if self._future.exception() is not None:
+            return JobState.FAILED
+        return JobState.DONE
+
+    @property
+    def running(self) -> bool:
+        """Whether the thread is still around, even if cancelled."""
+        return self._thread.is_alive()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def result(self) -> dict[Any, Any]:
+        return self._future.result()
+
+    @property
+    def error(self) -> BaseException | None:
+        return self._future.exception()
+
+    def cancel(self) -> None:
+        """Drop the connection and discard the result. The node still
+        finishes computing it on its side.
+        """
+        self._cancelled = True
+        self._api.abort()
@@ -11,10 +11,12 @@ from bitui.network.rpc import RPCSession
 class Calls(enum.Enum):
     """Implemented/supported commands"""
 
+    GETBESTBLOCKHASH = enum.auto()
     GETBLOCK = enum.auto()
     GETBLOCKCHAININFO = enum.auto()
     GETBLOCKCOUNT = enum.auto()
     GETBLOCKHASH = enum.auto()
+    GETTXOUTSETINFO = enum.auto()
 
 
 class BitcoinAPI:
@@ -33,12 +35,34 @@ class BitcoinAPI:
 
         return self._rpc_session.post(rpc_request)
 
+    def method_raw(self, call: Calls, args: list[str | int] = []) -> bytes:
+        """Same as `method`, but returns the unparsed response body."""
+        if not isinstance(call, Calls):
+            raise NotImplementedError(f'{call} not implemented')
+
+        rpc_request = RPCRequest.uuid(call.name.lower(), args)
+
+        return self._rpc_session.post_raw(rpc_request)
+
+    def abort(self) -> None:
+        """Interrupt the calls in flight, from any thread."""
+        self._rpc_session.abort()
+
+    def close(self) -> None:
+        self._rpc_session.close()
+
     # convenience methods
     def get_blockchain_info(self) -> RPCResponse.result:
         return self.method(Calls.GETBLOCKCHAININFO).result
 
+    def get_best_block_hash(self) -> RPCResponse.result:
+        return self.method(Calls.GETBESTBLOCKHASH).result
+
     def get_block_hash(self, height: int) -> RPCResponse.result:
         return self.method(Calls.GETBLOCKHASH, [height]).result
 
     def get_block(self, block_hash: str) -> RPCResponse.result:
         return self.method(Calls.GETBLOCK, [block_hash]).result
+
+    def get_block_raw(self, block_hash: str, verbosity: int = 1) -> bytes:
+        return self.method_raw(Calls.GETBLOCK, [block_hash, verbosity])
@@ -0,0 +1,127 @@
+"""Decoding of raw RPC responses into compact summaries.
+
+Parsing a verbosity 2 block is CPU bound, so it can be done in a process
+pool, keeping it away from the process drawing the TUI.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import NamedTuple
+
+from bitui.network.rpc import JSONRPCException
+from bitui.network.rpc import RPCResponse
+
+
+class DecodeConfig(NamedTuple):
+    # no pool is created with 0 workers, decoding happens in the caller
+    workers: int = 0
+    chunksize: int = 1
+    # `getblock` verbosity, 2 includes every transaction
+    verbosity: int = 1
+
+
+class BlockSummary(NamedTuple):
+    """What is kept of a `getblock` result."""
+    height: int
+    hash: str
+    time: int
+    nonce: int
+    confirmations: int
+    size: int
+    weight: int
+    n_tx: int
+    # only available with verbosity 2, in BTC
+    total_out: float = 0.0
+
+
+def _total_out(txs: list[Any]) -> float:
+    total = 0.0
+    for tx in txs:
+        # verbosity 1 only has the txids
+        if not isinstance(tx, dict):
+            return 0.0
+        for vout in tx['vout']:
+            total += vout['value']
+    return total
+
+
+def summarise_block(raw: bytes) -> BlockSummary:
+    """Build a `BlockSummary` from the raw body of a `getblock` response."""
+    response = RPCResponse.from_json(json.loads(raw))
+
+    if response.error is not None:
+        raise JSONRPCException(response.error)
+
+    block = response.result
+
+    return BlockSummary(
+        block['height'],
+        block['hash'],
+        block['time'],
+        block['nonce'],
+        block['confirmations'],
+        block['size'],
+        block['weight'],
+        block['nTx'],
+        _total_out(block['tx']),
+    )
+
+
+def summarise_blocks(raws: list[bytes]) -> list[BlockSummary]:
+    """Same as `summarise_block`, for a chunk of responses."""
+    return [summarise_block(raw) for raw in raws]
+
+
+class Decoder:
+    """Decode stage between the RPC layer and the controller. Returns
+    futures either way, so callers don't care whether there's a pool.
+    """
+
+    def __init__(self, decode_config: DecodeConfig = DecodeConfig()) -> None:
+        self._chunksize = max(1, decode_config.chunksize)
+        self._pool: Executor | None = None
+
+        if decode_config.workers > 0:
+            # the UI runs other threads, forking them can deadlock a worker
+            self._pool = ProcessPoolExecutor(
+                decode_config.workers,
+                mp_context=multiprocessing.get_context('forkserver'),
+            )
+
+    def submit(self, raws: list[bytes]) -> list[Future[list[BlockSummary]]]:
+        """Decode `raws` in chunks of `chunksize`. The futures are in the
+        same order as `raws`.
+        """
+        futures = []
+
+        for i in range(0, len(raws), self._chunksize):
+            chunk = raws[i:i + self._chunksize]
+
+            if self._pool is None:
+                future: Future[list[BlockSummary]] = Future()
+                try:
+                    future.set_result(summarise_blocks(chunk))
+                except Exception as exc:
+                    future.set_exception(exc)
+            else:
+                future = self._pool.submit(summarise_blocks, chunk)
+
+            futures.append(future)
+
+        return futures
+
+    def map(self, raws: list[bytes]) -> list[BlockSummary]:
+        """Blocking version of `submit`."""
+        ret = []
+        for future in self.submit(raws):
+            ret.extend(future.result())
+        return ret
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
@@ -0,0 +1,162 @@
+"""Concurrent polling of several nodes.
+
+Each node has its own session, while a shared `Scheduler` caps how many
+requests are in flight across all of them.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import TypeVar
+
+from bitui.network.btc import BitcoinAPI
+from bitui.network.btc import Calls
+from bitui.network.rpc import JSONRPCException
+from bitui.network.rpc import RPCConfig
+
+T = TypeVar('T')
+
+
+class NodeConfig(NamedTuple):
+    name: str
+    chain: str
+    rpc_config: RPCConfig
+
+
+class PollConfig(NamedTuple):
+    # requests in flight across every node
+    max_inflight: int = 4
+    # seconds between the end of a poll and the start of the next
+    interval: float = 5.0
+    # seconds, a hung node would otherwise hold a slot of the scheduler
+    timeout: float = 30.0
+
+
+class NodeStatus(NamedTuple):
+    """Last known state of a node."""
+    name: str
+    chain: str
+    blocks: int | None = None
+    headers: int | None = None
+    tip: str = ''
+    progress: float = 0.0
+    # seconds the last `getblockchaininfo` took
+    latency: float | None = None
+    error: str | None = None
+
+
+class Scheduler:
+    """Runs requests for every node, at most `max_inflight` at once."""
+
+    def __init__(self, max_inflight: int) -> None:
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_inflight),
+            thread_name_prefix='bitui-poll',
+        )
+
+    def submit(self, fn: Callable[[], T]) -> Future[T]:
+        return self._pool.submit(fn)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class NodePoller:
+    """Polls `getblockchaininfo` of a single node. Never blocks, `poll` is
+    meant to be called every frame.
+    """
+
+    def __init__(
+        self,
+        node_config: NodeConfig,
+        scheduler: Scheduler,
+        poll_config: PollConfig,
+    ) -> None:
+        # polls are sequential, one connection is enough
+        rpc_config = node_config.rpc_config._replace(
+            timeout=poll_config.timeout,
+            pool_size=1,
+        )
+        self._api = BitcoinAPI(rpc_config)
+        self._scheduler = scheduler
+        self._interval = poll_config.interval
+        self._inflight: Future[tuple[dict[Any, Any], float]] | None = None
+        self._next_at = 0.0
+
+        self.status = NodeStatus(node_config.name, node_config.chain)
+
+    def _query(self) -> tuple[dict[Any, Any], float]:
+        start = time.perf_counter()
+        response = self._api.method(Calls.GETBLOCKCHAININFO)
+        latency = time.perf_counter() - start
+
+        if response.error is not None:
+            raise JSONRPCException(response.error)
+
+        return response.result, latency
+
+    def _update(self, inflight: Future[tuple[dict[Any, Any], float]]) -> None:
+        try:
+            info, latency = inflight.result()
+        except Exception as exc:
+            # keep the last known values around
+            self.status = self.status._replace(error=str(exc) or repr(exc))
+            return
+
+        self.status = self.status._replace(
+            blocks=info['blocks'],
+            headers=info['headers'],
+            tip=info['bestblockhash'],
+            progress=info['verificationprogress'],
+            latency=latency,
+            error=None,
+        )
+
+    def poll(self) -> None:
+        if self._inflight is not None:
+            if not self._inflight.done():
+                return
+            self._update(self._inflight)
+            self._inflight = None
+            self._next_at = time.monotonic() + self._interval
+
+        if time.monotonic() >= self._next_at:
+            self._inflight = self._scheduler.submit(self._query)
+
+    def close(self) -> None:
+        self._api.close()
+
+
+class Dashboard:
+    """Polls every node concurrently through a shared `Scheduler`."""
+
+    def __init__(
+        self,
+        node_configs: list[NodeConfig],
+        poll_config: PollConfig = PollConfig(),
+    ) -> None:
+        self._scheduler = Scheduler(poll_config.max_inflight)
+        self._pollers = [
+            NodePoller(node_config, self._scheduler, poll_config)
+            for node_config in node_configs
+        ]
+
+    def __len__(self) -> int:
+        return len(self._pollers)
+
+    @property
+    def statuses(self) -> list[NodeStatus]:
+        return [poller.status for poller in self._pollers]
+
+    def poll(self) -> None:
+        for poller in self._pollers:
+            poller.poll()
+
+    def close(self) -> None:
+        self._scheduler.shutdown()
+        for poller in self._pollers:
+            poller.close()
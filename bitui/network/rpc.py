@@ -2,12 +2,20 @@
 from __future__ import annotations
 
 import json
+import socket
+import threading
 import uuid
+import weakref
 from typing import Any
 from typing import NamedTuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.connection import HTTPConnection
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
 
 from bitui.network.error import RPCErrorCode
 
@@ -23,6 +31,10 @@ class JSONRPCException(Exception):
 class RPCConfig(NamedTuple):
     url: str
     auth: HTTPBasicAuth
+    # seconds, `None` waits forever
+    timeout: float | None = None
+    # connections kept alive by the session, same default as `requests`
+    pool_size: int = 10
 
 
 class RPCRequest(NamedTuple):
@@ -66,6 +78,70 @@ class RPCResponse(NamedTuple):
         return cls(result, error, rpc_id)
 
 
+class _AbortableAdapter(HTTPAdapter):
+    """`HTTPAdapter` keeping track of the sockets it connects, so `abort`
+    can interrupt the requests in flight from another thread.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._lock = threading.Lock()
+        self._aborted = False
+        self._sockets: weakref.WeakSet[socket.socket] = weakref.WeakSet()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        track = self._track
+
+        class Connection(HTTPConnection):
+
+            def connect(self) -> None:
+                super().connect()
+                track(self.sock)
+
+        class SecureConnection(HTTPSConnection):
+
+            def connect(self) -> None:
+                super().connect()
+                track(self.sock)
+
+        class ConnectionPool(HTTPConnectionPool):
+            ConnectionCls = Connection
+
+        class SecureConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = SecureConnection
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': ConnectionPool,
+            'https': SecureConnectionPool,
+        }
+
+    def _track(self, sock: socket.socket) -> None:
+        with self._lock:
+            self._sockets.add(sock)
+            aborted = self._aborted
+
+        if aborted:
+            _shutdown(sock)
+
+    def abort(self) -> None:
+        with self._lock:
+            self._aborted = True
+            sockets = list(self._sockets)
+
+        for sock in sockets:
+            _shutdown(sock)
+
+
+def _shutdown(sock: socket.socket) -> None:
+    try:
+        # unlike `close`, wakes up the thread blocked reading it
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        # already closed
+        pass
+
+
 class RPCSession:
     """Class in charge of handling RPC communication."""
 
@@ -73,16 +149,33 @@ class RPCSession:
 
         self._session = requests.Session()
         self._session.auth = rpc_config.auth
+        self._adapter = _AbortableAdapter(pool_maxsize=rpc_config.pool_size)
+        self._session.mount('http://', self._adapter)
+        self._session.mount('https://', self._adapter)
         self._url = rpc_config.url
+        self._timeout = rpc_config.timeout
 
     def post(self, rpc_request: RPCRequest) -> RPCResponse:
         """Make a single rpc request."""
 
+        raw = self.post_raw(rpc_request)
+
+        return RPCResponse.from_json(json.loads(raw))
+
+    def post_raw(self, rpc_request: RPCRequest) -> bytes:
+        """Same as `post`, but returns the response body without parsing
+        it, so the decoding can happen somewhere else.
+        """
+
         data = json.dumps(rpc_request._asdict())
 
-        response = self._session.post(url=self._url, data=data)
+        response = self._session.post(
+            url=self._url,
+            data=data,
+            timeout=self._timeout,
+        )
 
-        return RPCResponse.from_json(response.json())
+        return response.content
 
     def batch(self, rpc_requests: list[RPCRequest]) -> list[RPCResponse]:
         """Make a batch of requests to be sent in one HTTP POST.
@@ -92,7 +185,11 @@ class RPCSession:
 
         data = json.dumps([r._asdict() for r in rpc_requests])
 
-        response = self._session.post(url=self._url, data=data)
+        response = self._session.post(
+            url=self._url,
+            data=data,
+            timeout=self._timeout,
+        )
 
         responses = [RPCResponse.from_json(r) for r in response.json()]
 
@@ -108,3 +205,14 @@ class RPCSession:
         responses.sort(key=match_idx)
 
         return responses
+
+    def abort(self) -> None:
+        """Interrupt the requests in flight, which raise
+        `requests.ConnectionError`, and make any later one fail too.
+        Unlike `close`, safe to call from another thread.
+        """
+        self._adapter.abort()
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._session.close()
@@ -118,6 +118,49 @@ class Pad:
         )
 
 
+class Layout(NamedTuple):
+    """Geometry of the block tiles inside a `Pad`. Pure arithmetic, so the
+    position of any tile can be known without drawing it.
+    """
+    height: int = 10
+    width: int = 20
+    y: int = 1
+    gap: int = 1
+
+    @classmethod
+    def fit(cls, frame_dim: Dim) -> Layout:
+        """Shrink the tile height so it fits inside `frame_dim` borders.
+        Might be too small for a tile, see `drawable`.
+        """
+        default = cls()
+        # the pad is drawn inside the frame borders, starting at row 0
+        height = min(default.height, frame_dim.height - 2 - default.y)
+        return default._replace(height=max(0, height))
+
+    @property
+    def drawable(self) -> bool:
+        """Whether there's room for the borders and a line of content."""
+        return self.height >= 3
+
+    @property
+    def step(self) -> int:
+        return self.width + self.gap
+
+    def dim(self, start: int, index: int) -> Dim:
+        """Return the `Dim` of the tile at `index`."""
+        x = start + self.step * index
+        return Dim(self.height, self.width, self.y, x)
+
+    def visible(self, start: int, view_start: int, view_width: int) -> range:
+        """Return the indexes of the tiles intersecting the view. Might
+        include indexes past the last existing tile.
+        """
+        view_end = view_start + view_width
+        first = (view_start - start - self.width) // self.step + 1
+        stop = -(-(view_end - start) // self.step)
+        return range(max(0, first), max(0, stop))
+
+
 class Block:
     """Framed window to be used as a block representation, with content
     inside.
@@ -128,30 +171,64 @@ class Block:
         self.win = Window(dim.inner(), pad)
 
     def write(self, content: str) -> None:
-        self.win.screen.addstr(content)
+        # content that doesn't fit after a resize is just truncated
+        try:
+            self.win.screen.addstr(content)
+        except curses.error:
+            pass
 
 
 class Chain:
     """Data structure to keep track of blocks creating them on the right
     place.
+
+    The content of each block is kept in `contents`, independent of curses.
+    Only the tiles visible in the pad are drawn, so the whole chain can be
+    rebuilt on top of a new `Pad`.
     """
 
-    def __init__(self, pad: Pad) -> None:
+    def __init__(self, pad: Pad, contents: list[str] | None = None) -> None:
         self.pad = pad
-        self.blocks: list[Block] = []
+        self.layout = Layout.fit(pad.frame_dim)
+        self.contents: list[str] = [] if contents is None else contents
+        self.blocks: dict[int, Block] = {}
 
         self.start = pad.dim.width // 2
 
     def __len__(self) -> int:
-        return len(self.blocks)
+        return len(self.contents)
 
     def new_block(self, content: str, *, prepend: bool = False) -> None:
-        # TODO: make `Dim` not hardcoded here
-        h, w, y = 10, 20, 1
-        x = self.start + (w + 1) * len(self)
-        dim = Dim(h, w, y, x)
-
-        block = Block(dim, self.pad.screen)
-        block.write(content)
-
-        self.blocks.append(block)
+        self.contents.append(content)
+        self.render()
+
+    def clear(self) -> None:
+        """Remove every block."""
+        self.pad.screen.erase()
+        self.contents.clear()
+        self.blocks.clear()
+
+    def visible(self) -> range:
+        """Indexes of the existing blocks visible in the pad."""
+        view = self.layout.visible(
+            self.start,
+            self.pad.view_start,
+            self.pad.frame_dim.width,
+        )
+        # tiles can't be drawn past the pad's width
+        fits = (self.pad.dim.width - self.start + self.layout.gap)
+        stop = min(view.stop, len(self), fits // self.layout.step)
+        return range(view.start, max(view.start, stop))
+
+    def render(self) -> None:
+        """Draw the visible blocks that weren't drawn yet."""
+        if not self.layout.drawable:
+            # terminal too small, drawn again once it's resized
+            return
+
+        for idx in self.visible():
+            if idx in self.blocks:
+                continue
+            block = Block(self.layout.dim(self.start, idx), self.pad.screen)
+            block.write(self.contents[idx])
+            self.blocks[idx] = block
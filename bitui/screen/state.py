@@ -16,6 +16,30 @@ if TYPE_CHECKING:
     Screen: TypeAlias = curses._CursesWindow
 
 
+# smallest terminal the windows can be built on
+MIN_LINES = 8
+MIN_COLS = 20
+
+
+def terminal_fits() -> bool:
+    return curses.LINES >= MIN_LINES and curses.COLS >= MIN_COLS
+
+
+def draw_too_small(stdscr: Screen) -> None:
+    """Replace the whole screen with a notice, until it's resized."""
+    stdscr.erase()
+    try:
+        stdscr.addnstr(
+            0,
+            0,
+            f'terminal too small, needs {MIN_COLS}x{MIN_LINES}',
+            curses.COLS,
+        )
+    except curses.error:
+        pass
+    stdscr.refresh()
+
+
 class TUIState(NamedTuple):
     """Container to keep track of the state of the TUI, both
     content and blockchain info.
@@ -30,7 +54,21 @@ class TUIState(NamedTuple):
     selected: list[Any] = []
 
     @classmethod
-    def init(cls, stdscr: Screen) -> TUIState:
+    def init(
+        cls,
+        stdscr: Screen,
+        contents: list[str] | None = None,
+        offset: int = 0,
+    ) -> TUIState:
+        """Build every window. `offset` is the scroll position relative to
+        the first block.
+        """
+        if not terminal_fits():
+            raise ValueError(
+                f'terminal must be at least {MIN_COLS}x{MIN_LINES}, '
+                f'got {curses.COLS}x{curses.LINES}',
+            )
+
         height = curses.LINES // 2 - 1
         width = curses.COLS - 2
 
@@ -42,7 +80,9 @@ class TUIState(NamedTuple):
         upper_frame = Window.frame(upper_dim, stdscr)
         lower_frame = Window.frame(lower_dim, stdscr)
 
-        chain = Chain(upper_pad)
+        chain = Chain(upper_pad, contents)
+        upper_pad.view_start = chain.start + offset
+        chain.render()
 
         return cls(
             stdscr,
@@ -53,6 +93,24 @@ class TUIState(NamedTuple):
             chain,
         )
 
+    def resize(self) -> TUIState:
+        """Rebuild every window to the current `curses.LINES` and
+        `curses.COLS`, keeping the block contents and the scroll position.
+        The terminal must fit, see `terminal_fits`.
+        """
+        offset = self.upper_pad.view_start - self.chain.start
+
+        self.stdscr.erase()
+        self.stdscr.box()
+        self.stdscr.refresh()
+
+        state = TUIState.init(self.stdscr, self.chain.contents, offset)
+
+        return state._replace(
+            chain_info=self.chain_info,
+            selected=self.selected,
+        )
+
     def refresh(self) -> None:
         self.upper_pad.refresh()
         self.lower_win.refresh()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import pathlib
+from typing import Iterator
+from unittest import mock
+
+import pytest
+from requests.auth import HTTPBasicAuth
+
+from bitui.controller import app as app_module
+from bitui.controller import session
+from bitui.controller.app import App
+from bitui.controller.app import Panel
+from bitui.controller.session import Snapshot
+from bitui.controller.utxo import JobState
+from bitui.network.decode import BlockSummary
+from bitui.network.poll import NodeConfig
+from bitui.network.rpc import RPCConfig
+
+RPC_CONFIG = RPCConfig('http://localhost:18443', HTTPBasicAuth('u', 'p'))
+NODE_CONFIGS = [
+    NodeConfig('localhost:18443', 'regtest', RPC_CONFIG),
+    NodeConfig('localhost:38332', 'signet', RPC_CONFIG),
+]
+
+
+@pytest.fixture
+def utxo_job() -> Iterator[mock.MagicMock]:
+    with mock.patch.object(app_module, 'UTXOJob') as utxo_job:
+        job = utxo_job.return_value
+        job.running = True
+        job.state = JobState.PENDING
+        job.elapsed = 0.0
+        yield utxo_job
+
+
+@pytest.fixture
+def api() -> Iterator[mock.MagicMock]:
+    with mock.patch.object(app_module, 'BitcoinAPI') as api:
+        yield api.return_value
+
+
+@pytest.fixture
+def app(utxo_job: mock.MagicMock, api: mock.MagicMock) -> Iterator[App]:
+    state = mock.MagicMock()
+    state.chain_info = {'blocks': 1, 'bestblockhash': 'old'}
+    state.chain.start = 0
+    state.lower_win.screen.getmaxyx.return_value = (10, 80)
+
+    with mock.patch.object(app_module.TUIState, 'init', return_value=state):
+        app = App(mock.MagicMock(), RPC_CONFIG)
+        yield app
+        app.close()
+
+
+def _summary(app: App) -> str:
+    screen = app._state.lower_win.screen
+    return str(screen.addnstr.call_args_list[0].args[2])
+
+
+def test_restore_session_node_unreachable(
+    app: App,
+    api: mock.MagicMock,
+    tmp_path: pathlib.Path,
+) -> None:
+    block = BlockSummary(1, 'tip', 0, 0, 1, 285, 1140, 1)
+    info = {'blocks': 1, 'bestblockhash': 'tip'}
+    app._session_path = tmp_path / 'node.json'
+    session.save(app._session_path, Snapshot('tip', 0, info, [block]))
+
+    api.get_best_block_hash.side_effect = ConnectionError
+    assert app.restore_session()
+    assert app._reload is not None
+    app._reload.exception(5)
+
+    app._state.lower_win.screen.reset_mock()
+    app.reconcile_session()
+    assert 'unreachable' in _summary(app)
+
+    # the node is back, with the same tip
+    api.get_best_block_hash.side_effect = None
+    api.get_best_block_hash.return_value = 'tip'
+    app._reload_at = 0.0
+    app.reconcile_session()
+    assert app._reload is not None
+    app._reload.result(5)
+
+    app._state.lower_win.screen.reset_mock()
+    app.reconcile_session()
+    assert _summary(app).startswith('blocks')
+    assert app._blocks == [block]
+
+
+def test_toggle_panels(app: App) -> None:
+    assert app._panel == Panel.SUMMARY
+
+    app.toggle_utxo()
+    assert app._panel == Panel.UTXO
+    app.refresh()
+    app.toggle_utxo()
+    assert app._panel == Panel.SUMMARY
+
+    app.toggle_nodes()
+    assert app._panel == Panel.NODES
+    app.refresh()
+    app.toggle_utxo()
+    assert app._panel == Panel.UTXO
+    app.toggle_nodes()
+    assert app._panel == Panel.NODES
+    app.toggle_nodes()
+    assert app._panel == Panel.SUMMARY
+
+
+def test_several_nodes_start_on_the_nodes_panel() -> None:
+    with mock.patch.object(app_module.TUIState, 'init'):
+        with mock.patch.object(app_module, 'BitcoinAPI'):
+            app = App(mock.MagicMock(), RPC_CONFIG, node_configs=NODE_CONFIGS)
+            app.close()
+
+    assert app._panel == Panel.NODES
+
+
+def test_utxo_result_for_a_newer_tip(
+    app: App,
+    utxo_job: mock.MagicMock,
+) -> None:
+    app.query_utxo()
+    job = utxo_job.return_value
+    assert utxo_job.call_count == 1
+
+    # a block arrived while computing
+    job.tip = 'old'
+    job.state = JobState.DONE
+    job.running = False
+    job.result = {'bestblock': 'new', 'height': 2}
+    app.collect_utxo()
+
+    assert app._utxo_job is None
+    assert app._utxo_result == job.result
+    assert app._utxo_cache.get('old') == job.result
+    assert app._utxo_cache.get('new') == job.result
+
+
+def test_utxo_single_job_at_a_time(
+    app: App,
+    utxo_job: mock.MagicMock,
+) -> None:
+    app.query_utxo()
+    job = utxo_job.return_value
+    assert utxo_job.call_count == 1
+
+    # cancelled, but the thread didn't finish yet
+    job.state = JobState.CANCELLED
+    app.query_utxo()
+    assert utxo_job.call_count == 1
+
+    job.running = False
+    app.query_utxo()
+    assert utxo_job.call_count == 2
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import pathlib
+
+from bitui.controller import session
+from bitui.controller.session import Snapshot
+from bitui.network.decode import BlockSummary
+
+
+def _snapshot() -> Snapshot:
+    blocks = [
+        BlockSummary(h, f'{h:064x}', 0, 0, 2 - h, 285, 1140, 1)
+        for h in range(2)
+    ]
+    return Snapshot(f'{1:064x}', 42, {'blocks': 2, 'chain': 'regtest'}, blocks)
+
+
+def test_snapshot_path() -> None:
+    path = session.snapshot_path('/cache', 'http://localhost:18443', 'regtest')
+    other = session.snapshot_path('/cache', 'http://localhost:18443', 'main')
+
+    assert path.parent == pathlib.Path('/cache/sessions')
+    assert path != other
+
+
+def test_save_and_load(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / 'sessions' / 'node.json'
+    snapshot = _snapshot()
+
+    session.save(path, snapshot)
+
+    assert session.load(path) == snapshot
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_load_unusable(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / 'node.json'
+    assert session.load(path) is None
+
+    path.write_text('{')
+    assert session.load(path) is None
+
+    old = _snapshot().to_json()
+    old['version'] = 0
+    path.write_text(json.dumps(old))
+    assert session.load(path) is None
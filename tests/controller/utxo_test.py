@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import http.server
+import json
+import pathlib
+import threading
+import time
+from typing import Any
+from typing import Iterator
+
+import pytest
+from requests.auth import HTTPBasicAuth
+
+from bitui.controller.utxo import JobState
+from bitui.controller.utxo import UTXOCache
+from bitui.controller.utxo import UTXOJob
+from bitui.network.rpc import RPCConfig
+
+RESULT = {'bestblock': 'tip', 'txouts': 10, 'total_amount': 50.0}
+
+
+class _Node:
+    """Stand-in for bitcoind, answering `gettxoutsetinfo` after `delay`."""
+
+    def __init__(self, delay: float = 0.0, error: Any = None) -> None:
+        self.delay = delay
+        self.error = error
+        self.requests: list[dict[Any, Any]] = []
+        node = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            def do_POST(self) -> None:
+                length = int(self.headers['Content-Length'])
+                request = json.loads(self.rfile.read(length))
+                request['auth'] = self.headers['Authorization']
+                node.requests.append(request)
+
+                if request['method'] == 'getbestblockhash':
+                    result: Any = 'tip'
+                else:
+                    time.sleep(node.delay)
+                    result = None if node.error else RESULT
+                response = {
+                    'result': result,
+                    'error': node.error,
+                    'id': request['id'],
+                }
+                body = json.dumps(response).encode()
+
+                try:
+                    self.send_response(500 if node.error else 200)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    # the client went away
+                    pass
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        address = ('127.0.0.1', 0)
+        self.server = http.server.ThreadingHTTPServer(address, Handler)
+        self.server.daemon_threads = True
+        threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={'poll_interval': 0.01},
+            daemon=True,
+        ).start()
+
+    @property
+    def rpc_config(self) -> RPCConfig:
+        host, port = self.server.server_address[:2]
+        return RPCConfig(f'http://{host!s}:{port}', HTTPBasicAuth('u', 'p'))
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def node() -> Iterator[_Node]:
+    node = _Node()
+    yield node
+    node.close()
+
+
+def test_cache_memory() -> None:
+    cache = UTXOCache()
+
+    assert cache.get('tip') is None
+    cache.put('tip', RESULT)
+    assert cache.get('tip') == RESULT
+    assert cache.get('other') is None
+
+
+def test_cache_disk(tmp_path: pathlib.Path) -> None:
+    UTXOCache(tmp_path / 'utxo').put('tip', RESULT)
+
+    assert UTXOCache(tmp_path / 'utxo').get('tip') == RESULT
+    assert UTXOCache().get('tip') is None
+
+
+def test_job_done(node: _Node) -> None:
+    job = UTXOJob(node.rpc_config, UTXOCache())
+    job._thread.join(5)
+
+    assert job.state == JobState.DONE
+    assert job.tip == 'tip'
+    assert job.result == RESULT
+    methods = [request['method'] for request in node.requests]
+    assert methods == ['getbestblockhash', 'gettxoutsetinfo']
+    assert node.requests[0]['auth'] == 'Basic dTpw'
+
+
+def test_job_cached(node: _Node) -> None:
+    cache = UTXOCache()
+    cache.put('tip', RESULT)
+    job = UTXOJob(node.rpc_config, cache)
+    job._thread.join(5)
+
+    assert job.state == JobState.DONE
+    assert job.result == RESULT
+    methods = [request['method'] for request in node.requests]
+    assert methods == ['getbestblockhash']
+
+
+def test_job_failed(node: _Node) -> None:
+    node.error = {'code': -28, 'message': 'Loading block index...'}
+    job = UTXOJob(node.rpc_config, UTXOCache())
+    job._thread.join(5)
+
+    assert job.state == JobState.FAILED
+    assert job.error is not None
+
+
+def test_job_cancel(node: _Node) -> None:
+    node.delay = 3.0
+    job = UTXOJob(node.rpc_config, UTXOCache())
+
+    while len(node.requests) < 2:
+        time.sleep(0.01)
+    assert job.state == JobState.PENDING
+    assert job.running
+
+    start = time.monotonic()
+    job.cancel()
+    job._thread.join(5)
+
+    # the request in flight is interrupted, not waited for
+    assert time.monotonic() - start < 1.0
+    assert not job.running
+    assert job.state == JobState.CANCELLED
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+from bitui.network.decode import BlockSummary
+from bitui.network.decode import DecodeConfig
+from bitui.network.decode import Decoder
+from bitui.network.decode import summarise_block
+from bitui.network.rpc import JSONRPCException
+
+
+def _raw_block(height: int, tx: list[Any]) -> bytes:
+    block = {
+        'height': height,
+        'hash': f'{height:064x}',
+        'time': 1231006505 + height,
+        'nonce': height * 2,
+        'confirmations': 1,
+        'size': 285,
+        'weight': 1140,
+        'nTx': len(tx),
+        'tx': tx,
+    }
+    return json.dumps({'result': block, 'error': None, 'id': '1'}).encode()
+
+
+def test_summarise_block_verbosity_1() -> None:
+    summary = summarise_block(_raw_block(1, ['txid']))
+
+    assert summary == BlockSummary(
+        1, f'{1:064x}', 1231006506, 2, 1, 285, 1140, 1, 0.0,
+    )
+
+
+def test_summarise_block_verbosity_2() -> None:
+    tx = {'vout': [{'value': 1.5}, {'value': 2.0}]}
+    summary = summarise_block(_raw_block(1, [tx, tx]))
+
+    assert summary.n_tx == 2
+    assert summary.total_out == 7.0
+
+
+def test_summarise_block_error() -> None:
+    error = {'code': -5, 'message': 'Block not found'}
+    raw = json.dumps({'result': None, 'error': error, 'id': '1'}).encode()
+
+    with pytest.raises(JSONRPCException):
+        summarise_block(raw)
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_decoder_keeps_order(workers: int) -> None:
+    raws = [_raw_block(h, ['txid']) for h in range(7)]
+    decoder = Decoder(DecodeConfig(workers=workers, chunksize=3))
+
+    try:
+        futures = decoder.submit(raws)
+        assert len(futures) == 3
+        assert [s.height for s in decoder.map(raws)] == list(range(7))
+    finally:
+        decoder.shutdown()
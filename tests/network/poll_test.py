@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import http.server
+import json
+import threading
+import time
+from typing import Any
+from typing import Iterator
+
+import pytest
+from requests.auth import HTTPBasicAuth
+
+from bitui.network.poll import Dashboard
+from bitui.network.poll import NodeConfig
+from bitui.network.poll import PollConfig
+from bitui.network.rpc import RPCConfig
+
+DELAY = 0.2
+
+
+class _Inflight:
+    """Counts the requests being handled across every server."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self) -> None:
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *args: Any) -> None:
+        with self._lock:
+            self.current -= 1
+
+
+def _server(blocks: int, inflight: _Inflight) -> http.server.HTTPServer:
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+
+        def do_POST(self) -> None:
+            length = int(self.headers['Content-Length'])
+            request = json.loads(self.rfile.read(length))
+
+            with inflight:
+                time.sleep(DELAY)
+
+            result = {
+                'blocks': blocks,
+                'headers': blocks + 1,
+                'bestblockhash': f'{blocks:064x}',
+                'verificationprogress': 0.5,
+            }
+            body = json.dumps(
+                {'result': result, 'error': None, 'id': request['id']},
+            ).encode()
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(
+        target=server.serve_forever,
+        kwargs={'poll_interval': 0.01},
+        daemon=True,
+    ).start()
+    return server
+
+
+@pytest.fixture
+def inflight() -> _Inflight:
+    return _Inflight()
+
+
+@pytest.fixture
+def servers(inflight: _Inflight) -> Iterator[list[http.server.HTTPServer]]:
+    servers = [_server(blocks, inflight) for blocks in (100, 200, 300, 400)]
+    yield servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _node_config(server: http.server.HTTPServer) -> NodeConfig:
+    host, port = server.server_address[:2]
+    url = f'http://{host!s}:{port}'
+    return NodeConfig(url, 'regtest', RPCConfig(url, HTTPBasicAuth('u', 'p')))
+
+
+def _poll_until_done(dashboard: Dashboard, timeout: float = 5.0) -> float:
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        dashboard.poll()
+        if all(s.latency or s.error for s in dashboard.statuses):
+            break
+        time.sleep(0.01)
+    return time.monotonic() - start
+
+
+def test_dashboard_polls_concurrently(
+    servers: list[http.server.HTTPServer],
+    inflight: _Inflight,
+) -> None:
+    node_configs = [_node_config(server) for server in servers]
+    dashboard = Dashboard(node_configs, PollConfig(max_inflight=4))
+
+    try:
+        elapsed = _poll_until_done(dashboard)
+    finally:
+        dashboard.close()
+
+    assert [s.blocks for s in dashboard.statuses] == [100, 200, 300, 400]
+    assert all(s.latency and s.latency >= DELAY for s in dashboard.statuses)
+    assert inflight.peak == 4
+    # sequential polling would take 4 times the delay
+    assert elapsed < DELAY * 3
+
+
+def test_dashboard_caps_inflight(
+    servers: list[http.server.HTTPServer],
+    inflight: _Inflight,
+) -> None:
+    node_configs = [_node_config(server) for server in servers]
+    dashboard = Dashboard(node_configs, PollConfig(max_inflight=2))
+
+    try:
+        _poll_until_done(dashboard)
+    finally:
+        dashboard.close()
+
+    assert [s.blocks for s in dashboard.statuses] == [100, 200, 300, 400]
+    assert inflight.peak == 2
+
+
+def test_dashboard_unreachable_node(
+    servers: list[http.server.HTTPServer],
+) -> None:
+    down = _server(0, _Inflight())
+    down.shutdown()
+    down.server_close()
+
+    node_configs = [_node_config(servers[0]), _node_config(down)]
+    dashboard = Dashboard(node_configs, PollConfig(timeout=1.0))
+
+    try:
+        _poll_until_done(dashboard)
+    finally:
+        dashboard.close()
+
+    up_status, down_status = dashboard.statuses
+    assert up_status.blocks == 100 and up_status.error is None
+    assert down_status.blocks is None and down_status.error
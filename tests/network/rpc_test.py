@@ -1,13 +1,22 @@
 """Basic JSON-RPC implementation."""
 from __future__ import annotations
 
+import socket
+import threading
+import time
 import uuid
 from unittest import mock
 
+import pytest
+import requests
+from requests.auth import HTTPBasicAuth
+
 from bitui.network.error import RPCErrorCode
+from bitui.network.rpc import RPCConfig
 from bitui.network.rpc import RPCError
 from bitui.network.rpc import RPCRequest
 from bitui.network.rpc import RPCResponse
+from bitui.network.rpc import RPCSession
 
 
 def test_request_with_uuid() -> None:
@@ -35,3 +44,26 @@ def test_response_from_json() -> None:
 
     resp = RPCResponse.from_json(with_error_input)
     assert resp._asdict() == with_error_output
+
+
+def test_session_abort() -> None:
+    # accepts the connection but never answers
+    server = socket.create_server(('127.0.0.1', 0))
+    host, port = server.getsockname()[:2]
+    rpc_config = RPCConfig(f'http://{host}:{port}', HTTPBasicAuth('u', 'p'))
+    rpc_session = RPCSession(rpc_config)
+
+    timer = threading.Timer(0.2, rpc_session.abort)
+    timer.start()
+    start = time.monotonic()
+    try:
+        with pytest.raises(requests.ConnectionError):
+            rpc_session.post(RPCRequest.uuid('getbestblockhash', []))
+        assert time.monotonic() - start < 5.0
+
+        # and the session stays aborted
+        with pytest.raises(requests.ConnectionError):
+            rpc_session.post(RPCRequest.uuid('getbestblockhash', []))
+    finally:
+        timer.cancel()
+        server.close()
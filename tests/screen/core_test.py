@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import curses
+from unittest import mock
+
+from bitui.screen.core import Chain
+from bitui.screen.core import Dim
+from bitui.screen.core import Layout
+from bitui.screen.core import Pad
+
+
+def test_layout_dim() -> None:
+    layout = Layout(10, 20, 1, 1)
+
+    assert layout.dim(100, 0) == Dim(10, 20, 1, 100)
+    assert layout.dim(100, 2) == Dim(10, 20, 1, 142)
+
+
+def test_layout_fit() -> None:
+    assert Layout.fit(Dim(30, 80)).height == 10
+    assert Layout.fit(Dim(8, 80)).height == 5
+    assert Layout.fit(Dim(6, 80)).drawable
+    assert not Layout.fit(Dim(5, 80)).drawable
+    assert Layout.fit(Dim(2, 80)).height == 0
+
+
+def test_layout_visible() -> None:
+    layout = Layout(10, 20, 1, 1)
+
+    # tiles at 100-119, 121-140, 142-161, 163-182
+    assert layout.visible(100, 100, 21) == range(0, 1)
+    assert layout.visible(100, 100, 22) == range(0, 2)
+    assert layout.visible(100, 120, 22) == range(1, 2)
+    assert layout.visible(100, 120, 23) == range(1, 3)
+    assert layout.visible(100, 141, 1) == range(2, 2)
+    assert layout.visible(100, 0, 50) == range(0, 0)
+    assert layout.visible(100, 0, 101) == range(0, 1)
+
+
+def _chain(view_width: int = 50, height: int = 20) -> Chain:
+    frame_dim = Dim(height, view_width, 1, 1)
+    with mock.patch.object(curses, 'newpad'):
+        pad = Pad(frame_dim._replace(width=view_width * 10), frame_dim)
+    return Chain(pad)
+
+
+def test_chain_visible() -> None:
+    chain = _chain()
+    # tiles are 21 wide with the gap, the view is 50
+    assert chain.visible() == range(0, 0)
+
+    for i in range(10):
+        chain.contents.append(f'block {i}')
+    assert chain.visible() == range(0, 3)
+
+    chain.pad.scroll(42)
+    assert chain.visible() == range(2, 5)
+
+    # clipped to the end of the pad
+    chain.pad.scroll(1000)
+    assert chain.visible() == range(9, 10)
+
+
+def test_chain_render_only_visible() -> None:
+    chain = _chain()
+    for i in range(10):
+        chain.new_block(f'block {i}')
+
+    assert len(chain) == 10
+    assert sorted(chain.blocks) == [0, 1, 2]
+
+    drawn = chain.blocks[0]
+    chain.pad.scroll(42)
+    chain.render()
+    assert sorted(chain.blocks) == [0, 1, 2, 3, 4]
+    # already drawn tiles are kept
+    assert chain.blocks[0] is drawn
+
+
+def test_chain_render_too_small() -> None:
+    chain = _chain(height=5)
+    chain.new_block('block')
+
+    assert not chain.layout.drawable
+    assert chain.contents == ['block']
+    assert chain.blocks == {}
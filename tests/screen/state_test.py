@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import curses
+from typing import Any
+from typing import Iterator
+from unittest import mock
+
+import pytest
+
+from bitui.screen.state import TUIState
+
+
+def _terminal(lines: int, cols: int) -> Any:
+    return mock.patch.multiple(curses, LINES=lines, COLS=cols, create=True)
+
+
+@pytest.fixture(autouse=True)
+def newpad() -> Iterator[None]:
+    with mock.patch.object(curses, 'newpad'):
+        yield
+
+
+def test_init_too_small() -> None:
+    with _terminal(7, 80):
+        with pytest.raises(ValueError):
+            TUIState.init(mock.MagicMock())
+
+
+def test_resize_keeps_contents_and_offset() -> None:
+    with _terminal(40, 120):
+        state = TUIState.init(mock.MagicMock())
+        for i in range(30):
+            state.chain.new_block(f'block {i}')
+        state.upper_pad.scroll(42)
+        offset = state.upper_pad.view_start - state.chain.start
+
+    with _terminal(20, 60):
+        resized = state.resize()
+
+    assert resized.chain is not state.chain
+    assert resized.chain.contents == [f'block {i}' for i in range(30)]
+    assert resized.upper_pad.view_start - resized.chain.start == offset
+    assert resized.upper_pad.frame_dim.width == 58
+    assert resized.chain_info is state.chain_info
+    # only the tiles visible in the new, narrower, view are drawn
+    assert sorted(resized.chain.blocks) == [2, 3, 4]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from argparse import Namespace
+
+from requests.auth import HTTPBasicAuth
+
+from bitui.utils import node_configs_from_args
+
+
+def _args(**kwargs: object) -> Namespace:
+    defaults: dict[str, object] = {
+        'url': ['http://a:8332', 'http://b:8332'],
+        'chain': ['main', 'main'],
+        'username': ['u', 'u'],
+        'password': ['p', 'p'],
+        'cookie': False,
+        'data_dir': '~/.bitcoin',
+    }
+    defaults.update(kwargs)
+    return Namespace(**defaults)
+
+
+def test_node_configs_per_node_auth() -> None:
+    args = _args(username=['u1', 'u2'], password=['p1', 'p2'])
+    node_configs = node_configs_from_args(args)
+
+    assert [c.name for c in node_configs] == ['a:8332', 'b:8332']
+    assert node_configs[0].rpc_config.auth == HTTPBasicAuth('u1', 'p1')
+    assert node_configs[1].rpc_config.auth == HTTPBasicAuth('u2', 'p2')
+
+
+def test_node_configs_url_userinfo() -> None:
+    args = _args(url=['http://a:8332', 'http://x:p%40ss@b:8332/wallet/w'])
+    node_configs = node_configs_from_args(args)
+
+    assert node_configs[0].rpc_config.auth == HTTPBasicAuth('u', 'p')
+    # stripped from the url, which `requests` would otherwise override
+    assert node_configs[1].name == 'b:8332'
+    assert node_configs[1].rpc_config.url == 'http://b:8332/wallet/w'
+    assert node_configs[1].rpc_config.auth == HTTPBasicAuth('x', 'p@ss')
+
+
+def test_node_configs_url_userinfo_over_cookie() -> None:
+    args = _args(url=['http://x:y@a:8332'], chain=['main'], cookie=True)
+    node_configs = node_configs_from_args(args)
+
+    assert node_configs[0].rpc_config.auth == HTTPBasicAuth('x', 'y')